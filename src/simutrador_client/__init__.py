@@ -1,10 +1,12 @@
 from importlib.metadata import PackageNotFoundError as _PkgNF
 from importlib.metadata import version as _pkg_version
+from typing import TYPE_CHECKING, Any
 
-from .auth import AuthClient, get_auth_client
-from .settings import get_settings
-from .strategy import Strategy
-from .websocket import SimutradorClientSession
+if TYPE_CHECKING:
+    from .auth import AuthClient, get_auth_client
+    from .settings import get_settings
+    from .strategy import Strategy
+    from .websocket import SimutradorClientSession
 
 __all__ = [
     "__version__",
@@ -18,6 +20,31 @@ __all__ = [
     "Strategy",
 ]
 
+# Lazily resolve the public names (PEP 562) so importing the package does not
+# eagerly pull in httpx/websockets/pydantic-settings; callers that only need
+# __version__ or one submodule skip the rest of the import chain.
+_EXPORTS = {
+    "AuthClient": ".auth",
+    "get_auth_client": ".auth",
+    "get_settings": ".settings",
+    "Strategy": ".strategy",
+    "SimutradorClientSession": ".websocket",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(module_name, __name__), name)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
 def _resolve_version() -> str:
     for dist in ("simutrador-client", "simutrador_client"):
         try:
@@ -6,17 +6,22 @@ from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
 from types import SimpleNamespace
-from typing import Any
+from typing import Any, cast
 from uuid import uuid4
 
-import websockets
-
 from .auth import AuthClient, AuthenticationError, get_auth_client
 from .settings import get_settings
 from .store import Store
 from .strategy import DecisionOnlyStrategy, OrderSpec, Strategy
 
 
+def _serialize_datetime(value: Any) -> Any:
+    """Serialize datetime values to ISO-8601 strings; other values pass through."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
 class SessionProtocolError(Exception):
     """Raised when the WebSocket protocol returns an unexpected message or shape."""
 
@@ -232,6 +237,10 @@ class SimutradorClientSession:
         if not self._auth.get_cached_token():
             raise AuthenticationError("Not authenticated. Call auth.login(api_key) first.")
 
+        # Deferred import: the transport is only needed once a connection is
+        # actually opened, so importing the package stays cheap.
+        import websockets
+
         ws_url = self._compose_ws_url()
         self._ws = await websockets.connect(ws_url)
         self._reader_task = asyncio.create_task(self._recv_loop())
@@ -288,15 +297,10 @@ class SimutradorClientSession:
         self._ensure_connected()
 
         # Build request payload
-        def _ser_dt(v: Any) -> Any:
-            if isinstance(v, datetime):
-                return v.isoformat()
-            return v
-
         data: dict[str, Any] = {
             "symbols": symbols,
-            "start_date": _ser_dt(start_date),
-            "end_date": _ser_dt(end_date),
+            "start_date": _serialize_datetime(start_date),
+            "end_date": _serialize_datetime(end_date),
             "initial_capital": initial_capital,
             "timeframe": timeframe,
             "warmup_bars": warmup_bars,
@@ -635,11 +639,10 @@ class SimutradorClientSession:
         typ: str | None = obj.get("type")
         raw_data: Any = obj.get("data")
         data: dict[str, Any]
-        from typing import cast as _cast  # local import to avoid global unused import if optimized
         if isinstance(raw_data, dict):
-            data = _cast(dict[str, Any], raw_data)
+            data = cast(dict[str, Any], raw_data)
         else:
-            data = _cast(dict[str, Any], {})
+            data = cast(dict[str, Any], {})
         rid_any: Any = obj.get("request_id")
         rid: str | None = rid_any if isinstance(rid_any, str) else None
 
@@ -0,0 +1,51 @@
+"""
+Microbenchmarks for the hot Store paths (history ingest and per-tick update).
+
+These pin the cost of the candle-coercion loop so refactors that add overhead
+to the tick path show up in CI numbers. Benchmarking is disabled by default
+(see addopts); run with --benchmark-enable to collect timings.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from simutrador_client.store import Store
+
+
+def _candle(ts: datetime) -> dict[str, Any]:
+    return {
+        "date": ts.isoformat(),
+        "open": 100.0,
+        "high": 101.0,
+        "low": 99.5,
+        "close": 100.5,
+        "volume": 1000,
+    }
+
+
+_START = datetime(2023, 1, 2, 10, 0, 0, tzinfo=UTC)
+
+_HISTORY_SNAPSHOT = {
+    "candles": {
+        "AAPL": [_candle(_START + timedelta(minutes=i)) for i in range(500)],
+    }
+}
+
+_TICK = {"candles": {"AAPL": _candle(_START)}}
+
+
+@pytest.mark.benchmark(group="store")
+def test_from_history_500_candles(benchmark: Any) -> None:
+    store = benchmark(Store.from_history, _HISTORY_SNAPSHOT)
+    assert len(store._by_symbol["AAPL"].close) == 500
+
+
+@pytest.mark.benchmark(group="store")
+def test_apply_tick(benchmark: Any) -> None:
+    store = Store.from_history(_HISTORY_SNAPSHOT)
+    benchmark(store.apply_tick, _TICK)
+    assert store._by_symbol["AAPL"].close[-1] == 100.5
@@ -8,10 +8,14 @@ import faulthandler
 import os
 import sys
 import threading
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import TYPE_CHECKING, Any, cast
 
 import pytest
 
+if TYPE_CHECKING:
+    from tests.ws_fakes import WsClientFactory
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment() -> Generator[None, None, None]:
@@ -20,6 +24,79 @@ def setup_test_environment() -> Generator[None, None, None]:
     yield
 
 
+@pytest.fixture
+async def make_ws_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator["WsClientFactory", None]:
+    """Factory for a connected SimutradorClientSession wired to a FakeWS.
+
+    Hoists the fake-connect patch, client construction and the connect/close
+    lifecycle out of the individual test bodies; every client built here is
+    closed on teardown. Pass a strategy to override the default NoopStrategy.
+    """
+    import websockets
+
+    from simutrador_client.websocket import SimutradorClientSession
+    from tests.ws_fakes import FakeAuth, FakeWS, NoopStrategy
+
+    clients: list[SimutradorClientSession] = []
+
+    async def _make(strategy: Any = None) -> tuple[SimutradorClientSession, FakeWS]:
+        fake_ws = FakeWS()
+
+        async def fake_connect(url: str) -> FakeWS:
+            assert "/ws/simulate" in url
+            assert "token=" in url
+            return fake_ws
+
+        monkeypatch.setattr(websockets, "connect", fake_connect)
+        client = SimutradorClientSession(
+            strategy=strategy if strategy is not None else NoopStrategy(),
+            auth=cast(Any, FakeAuth()),
+            base_ws_url="ws://localhost:8003",
+        )
+        await client.connect()
+        clients.append(client)
+        return client, fake_ws
+
+    yield _make
+    for client in clients:
+        await client.close()
+
+
+def pytest_asyncio_loop_factories(
+    config: pytest.Config, item: pytest.Item  # noqa: ARG001 - pluggy matches by name
+) -> dict[str, object]:
+    """Run the async tests on uvloop where available.
+
+    Falls back to the stock asyncio loop on platforms without uvloop
+    (Windows). This is the pytest-asyncio >=1.4 replacement for overriding
+    the deprecated ``event_loop_policy`` fixture.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(autouse=True)
+def restore_global_auth_client() -> Generator[None, None, None]:
+    """Snapshot and restore the module-level auth client around each test.
+
+    set_auth_client() mutates process-global state; without this, a test that
+    installs a custom client leaks it into later tests and makes the suite
+    sensitive to execution order (e.g. under pytest-xdist).
+    """
+    import simutrador_client.auth as auth_module
+
+    saved = (auth_module._auth_client, auth_module._auth_client_is_custom)
+    yield
+    auth_module._auth_client, auth_module._auth_client_is_custom = saved
+
+
 # Always-on watchdog: dump stacks if a test phase stalls > 5s
 @pytest.fixture(autouse=True)
 def watchdog() -> Generator[None, None, None]:
@@ -70,7 +70,7 @@ async def _recv_relevant(
         return None
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
 async def test_connection_limit_rate_limiting_observed():
     """Open multiple concurrent WS connections and expect some to be RATE_LIMITED.
 
@@ -122,7 +122,7 @@ async def test_connection_limit_rate_limiting_observed():
         )
 
 
-@pytest.mark.asyncio
+@pytest.mark.integration
 async def test_message_burst_rate_limiting_observed():
     """Send a burst of start_simulation messages and expect RATE_LIMITED (close or error)."""
     await _ensure_authenticated()
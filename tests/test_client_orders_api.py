@@ -1,74 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from typing import Any, cast
 
 import pytest
 
-from simutrador_client.websocket import SessionProtocolError, SimutradorClientSession
+from simutrador_client.websocket import SessionProtocolError
+from tests.ws_fakes import WsClientFactory, batch_ack_msg
 
 
-class _NoopStrategy:
-    async def on_session_start(self, session_id: str, store: Any, meta: dict[str, Any] | None = None) -> None:
-        return None
-
-    async def on_tick(self, session_id: str, tick: Any, store: Any) -> None:
-        return None
-
-    async def on_fill(self, session_id: str, fill: Any, store: Any) -> None:
-        return None
-
-    async def on_account_snapshot(self, session_id: str, account: Any, store: Any) -> None:
-        return None
-
-    async def on_session_end(self, session_id: str, end: Any, store: Any) -> None:
-        return None
-
-
-class FakeAuth:
-    def get_cached_token(self) -> str | None:
-        return "FAKE"
-
-    def get_websocket_url(self, base_ws_url: str) -> str:
-        sep = "&" if "?" in base_ws_url else "?"
-        return f"{base_ws_url}{sep}token=FAKE"
-
-
-class FakeWS:
-    def __init__(self) -> None:
-        self.sent: list[dict[str, Any]] = []
-        self._q: asyncio.Queue[str] = asyncio.Queue()
-
-    async def send(self, text: str) -> None:
-        self.sent.append(json.loads(text))
-
-    async def recv(self) -> str:
-        return await self._q.get()
-
-    async def close(self) -> None:  # pragma: no cover - trivial
-        return None
-
-    # Helper to push an incoming message
-    async def push(self, obj: dict[str, Any]) -> None:
-        await self._q.put(json.dumps(obj))
-
-
-@pytest.mark.asyncio
-async def test_submit_orders_happy_path_returns_batch_ack(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        assert "/ws/simulate" in url
-        assert "token=" in url
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(strategy=_NoopStrategy(), auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
+async def test_submit_orders_happy_path_returns_batch_ack(make_ws_client: WsClientFactory) -> None:
+    client, fake_ws = await make_ws_client()
 
     # Start submit_orders in background
     orders = [
@@ -77,52 +19,41 @@ async def test_submit_orders_happy_path_returns_batch_ack(monkeypatch: pytest.Mo
     task = asyncio.create_task(client.submit_orders("sess-1", orders, batch_id="b1"))
 
     # Wait until outbound order_batch is sent
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    assert fake_ws.sent, "Client did not send order_batch"
-
-    outbound: dict[str, Any] = fake_ws.sent[-1]
+    outbound: dict[str, Any] = await fake_ws.wait_for_sent()
     assert outbound["type"] == "order_batch"
     rid = outbound.get("request_id")
     assert isinstance(rid, str)
 
     # Respond with batch_ack
-    await fake_ws.push(
-        {
-            "type": "batch_ack",
-            "request_id": rid,
-            "data": {
-                "batch_id": "b1",
-                "accepted_orders": ["o1"],
-                "rejected_orders": {},
-                "estimated_fills": {},
-            },
-        }
-    )
+    await fake_ws.push(batch_ack_msg(rid, "b1", ["o1"]))
 
     ack = await task
     assert ack["batch_id"] == "b1"
     assert ack["accepted_orders"] == ["o1"]
     assert ack["rejected_orders"] == {}
 
-    await client.close()
-
-
-@pytest.mark.asyncio
-async def test_submit_orders_invalid_ack_raises(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
-
-    import websockets
 
-    monkeypatch.setattr(websockets, "connect", fake_connect)
 
-    client = SimutradorClientSession(strategy=_NoopStrategy(), auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
+@pytest.mark.parametrize(
+    "response",
+    [
+        pytest.param(
+            {
+                "type": "batch_ack",
+                "data": {"accepted_orders": ["o1"], "rejected_orders": {}, "estimated_fills": {}},
+            },
+            id="malformed_ack_missing_batch_id",
+        ),
+        pytest.param(
+            {"type": "error", "data": {"error_code": "INVALID"}},
+            id="server_error",
+        ),
+    ],
+)
+async def test_submit_orders_bad_response_raises(
+    make_ws_client: WsClientFactory, response: dict[str, Any]
+) -> None:
+    client, fake_ws = await make_ws_client()
 
     task = asyncio.create_task(
         client.submit_orders(
@@ -132,42 +63,19 @@ async def test_submit_orders_invalid_ack_raises(monkeypatch: pytest.MonkeyPatch)
         )
     )
 
-    # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    outbound = fake_ws.sent[-1]
-    rid = outbound.get("request_id")
-
-    # Send malformed ack (missing batch_id)
-    await fake_ws.push(
-        {
-            "type": "batch_ack",
-            "request_id": rid,
-            "data": {"accepted_orders": ["o1"], "rejected_orders": {}, "estimated_fills": {}},
-        }
-    )
+    # Wait for outbound, then answer with the bad frame under the same request_id
+    outbound = await fake_ws.wait_for_sent()
+    await fake_ws.push({**response, "request_id": outbound.get("request_id")})
 
     with pytest.raises(SessionProtocolError):
         await task
 
-    await client.close()
 
 
-@pytest.mark.asyncio
-async def test_submit_orders_send_failure_raises(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(strategy=_NoopStrategy(), auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
+async def test_submit_orders_send_failure_raises(
+    make_ws_client: WsClientFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client, fake_ws = await make_ws_client()
 
     async def failing_send(text: str) -> None:  # noqa: ARG001 - signature must match
         raise RuntimeError("send failed")
@@ -181,22 +89,10 @@ async def test_submit_orders_send_failure_raises(monkeypatch: pytest.MonkeyPatch
             [{"order_id": "o1", "symbol": "AAPL", "side": "buy", "type": "market", "quantity": 1}],
         )
 
-    await client.close()
-
 
-@pytest.mark.asyncio
-async def test_place_bracket_order_builds_order_payload(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
 
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(strategy=_NoopStrategy(), auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
+async def test_place_bracket_order_builds_order_payload(make_ws_client: WsClientFactory) -> None:
+    client, fake_ws = await make_ws_client()
 
     # Start place_bracket_order in background so we can inspect outbound
     task = asyncio.create_task(
@@ -215,107 +111,36 @@ async def test_place_bracket_order_builds_order_payload(monkeypatch: pytest.Monk
     )
 
     # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    outbound = fake_ws.sent[-1]
-    assert outbound["type"] == "order_batch"
-    data = cast(dict[str, Any], outbound.get("data") or {})
-    orders = cast(list[dict[str, Any]], data.get("orders") or [])
-    assert isinstance(orders, list) and len(orders) == 1
+    outbound, orders = await fake_ws.wait_for_order_batch()
+    assert len(orders) == 1
     order = orders[0]
-    assert order["symbol"] == "AAPL"
-    assert order["side"] == "buy"
-    assert order["type"] == "limit"
-    assert order["quantity"] == 5
-    assert order.get("price") == 123.45
-    assert order.get("stop_loss") == 120.0
-    assert order.get("take_profit") == 130.0
-    assert order.get("time_in_force") == "day"
+    # Compare the whole payload at once (minus the generated order_id) so a
+    # mismatch reports every differing field in one diff.
     assert isinstance(order.get("order_id"), str)
+    assert {k: v for k, v in order.items() if k != "order_id"} == {
+        "symbol": "AAPL",
+        "side": "buy",
+        "type": "limit",
+        "quantity": 5,
+        "time_in_force": "day",
+        "price": 123.45,
+        "stop_loss": 120.0,
+        "take_profit": 130.0,
+    }
 
     # Complete with ack
     rid = outbound.get("request_id")
-    await fake_ws.push(
-        {
-            "type": "batch_ack",
-            "request_id": rid,
-            "data": {
-                "batch_id": "b3",
-                "accepted_orders": [order["order_id"]],
-                "rejected_orders": {},
-                "estimated_fills": {},
-            },
-        }
-    )
+    await fake_ws.push(batch_ack_msg(rid, "b3", [order["order_id"]]))
 
     ack = await task
     assert ack["batch_id"] == "b3"
 
-    await client.close()
-
-
-
-
-@pytest.mark.asyncio
-async def test_submit_orders_server_error_rejects_future(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(strategy=_NoopStrategy(), auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
-
-    # Start submit_orders in background
-    task = asyncio.create_task(
-        client.submit_orders(
-            "sess-1",
-            [{"order_id": "o1", "symbol": "AAPL", "side": "buy", "type": "market", "quantity": 1}],
-            batch_id="b_err",
-        )
-    )
-
-    # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    outbound = fake_ws.sent[-1]
-    rid = outbound.get("request_id")
-
-    # Push a server error with the same request_id
-    await fake_ws.push({"type": "error", "request_id": rid, "data": {"error_code": "INVALID"}})
-
-    with pytest.raises(SessionProtocolError):
-        await task
-
-    await client.close()
 
 
 
-@pytest.mark.asyncio
-async def test_submit_orders_nowait_returns_task_and_ack(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
 
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(
-        strategy=_NoopStrategy(),
-        auth=cast(Any, FakeAuth()),
-        base_ws_url="ws://localhost:8003",
-    )
-    await client.connect()
+async def test_submit_orders_nowait_returns_task_and_ack(make_ws_client: WsClientFactory) -> None:
+    client, fake_ws = await make_ws_client()
 
     orders = [
         {"order_id": "o1", "symbol": "AAPL", "side": "buy", "type": "market", "quantity": 10}
@@ -324,53 +149,20 @@ async def test_submit_orders_nowait_returns_task_and_ack(monkeypatch: pytest.Mon
     assert isinstance(task, asyncio.Task)
 
     # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    assert fake_ws.sent, "Client did not send order_batch"
-
-    outbound = fake_ws.sent[-1]
+    outbound = await fake_ws.wait_for_sent()
     assert outbound["type"] == "order_batch"
     rid = outbound.get("request_id")
     assert isinstance(rid, str)
 
-    await fake_ws.push(
-        {
-            "type": "batch_ack",
-            "request_id": rid,
-            "data": {
-                "batch_id": "b_nowait",
-                "accepted_orders": ["o1"],
-                "rejected_orders": {},
-                "estimated_fills": {},
-            },
-        }
-    )
+    await fake_ws.push(batch_ack_msg(rid, "b_nowait", ["o1"]))
 
     ack = await task
     assert ack["batch_id"] == "b_nowait"
 
-    await client.close()
-
-
-@pytest.mark.asyncio
-async def test_place_bracket_order_nowait_returns_task(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        return fake_ws
 
-    import websockets
 
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
-    client = SimutradorClientSession(
-        strategy=_NoopStrategy(),
-        auth=cast(Any, FakeAuth()),
-        base_ws_url="ws://localhost:8003",
-    )
-    await client.connect()
+async def test_place_bracket_order_nowait_returns_task(make_ws_client: WsClientFactory) -> None:
+    client, fake_ws = await make_ws_client()
 
     task = client.place_bracket_order_nowait(
         "sess-1",
@@ -383,31 +175,12 @@ async def test_place_bracket_order_nowait_returns_task(monkeypatch: pytest.Monke
     assert isinstance(task, asyncio.Task)
 
     # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    outbound = fake_ws.sent[-1]
-    assert outbound["type"] == "order_batch"
-    data = cast(dict[str, Any], outbound.get("data") or {})
-    orders = cast(list[dict[str, Any]], data.get("orders") or [])
+    outbound, orders = await fake_ws.wait_for_order_batch()
     order_id = cast(str, orders[0].get("order_id"))
     rid = outbound.get("request_id")
 
-    await fake_ws.push(
-        {
-            "type": "batch_ack",
-            "request_id": rid,
-            "data": {
-                "batch_id": "b_nowait",
-                "accepted_orders": [order_id],
-                "rejected_orders": {},
-                "estimated_fills": {},
-            },
-        }
-    )
+    await fake_ws.push(batch_ack_msg(rid, "b_nowait", [order_id]))
 
     ack = await task
     assert ack["batch_id"] == "b_nowait"
 
-    await client.close()
@@ -1,41 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from datetime import UTC, datetime
-from typing import Any, cast
+from typing import Any
 
-import pytest
+from tests.ws_fakes import WsClientFactory, history_snapshot_msg, session_created_msg
 
-from simutrador_client.websocket import SimutradorClientSession
-
-
-class FakeAuth:
-    def get_cached_token(self) -> str | None:
-        return "FAKE"
-
-    def get_websocket_url(self, base_ws_url: str) -> str:
-        sep = "&" if "?" in base_ws_url else "?"
-        return f"{base_ws_url}{sep}token=FAKE"
-
-
-class FakeWS:
-    def __init__(self) -> None:
-        self.sent: list[dict[str, Any]] = []
-        self._q: asyncio.Queue[str] = asyncio.Queue()
-
-    async def send(self, text: str) -> None:
-        self.sent.append(json.loads(text))
-
-    async def recv(self) -> str:
-        return await self._q.get()
-
-    async def close(self) -> None:  # pragma: no cover - trivial
-        return None
-
-    # Helper to push an incoming message
-    async def push(self, obj: dict[str, Any]) -> None:
-        await self._q.put(json.dumps(obj))
+# Simulation window used by the start_simulation call; built once at import.
+_START = datetime(2023, 1, 2, 10, 0, 0, tzinfo=UTC)
+_END = datetime(2023, 1, 3, 10, 0, 0, tzinfo=UTC)
 
 
 class RecordingStrategy:
@@ -64,29 +37,16 @@ class RecordingStrategy:
         self._end_ev.set()
 
 
-@pytest.mark.asyncio
-async def test_strategy_callbacks_invoked(monkeypatch: pytest.MonkeyPatch) -> None:
-    fake_ws = FakeWS()
-
-    async def fake_connect(url: str):  # type: ignore[override]
-        assert "/ws/simulate" in url
-        assert "token=" in url
-        return fake_ws
-
-    import websockets
-
-    monkeypatch.setattr(websockets, "connect", fake_connect)
-
+async def test_strategy_callbacks_invoked(make_ws_client: WsClientFactory) -> None:
     strat = RecordingStrategy()
-    client = SimutradorClientSession(strategy=strat, auth=cast(Any, FakeAuth()), base_ws_url="ws://localhost:8003")
-    await client.connect()
+    client, fake_ws = await make_ws_client(strat)
 
     # Start in background
     start_task = asyncio.create_task(
         client.start_simulation(
             symbols=["AAPL"],
-            start_date=datetime(2023, 1, 2, 10, 0, 0, tzinfo=UTC),
-            end_date=datetime(2023, 1, 3, 10, 0, 0, tzinfo=UTC),
+            start_date=_START,
+            end_date=_END,
             initial_capital=100000,
             timeframe="1min",
             warmup_bars=2,
@@ -94,52 +54,17 @@ async def test_strategy_callbacks_invoked(monkeypatch: pytest.MonkeyPatch) -> No
     )
 
     # Wait for outbound
-    for _ in range(100):
-        if fake_ws.sent:
-            break
-        await asyncio.sleep(0.01)
-    outbound: dict[str, Any] = fake_ws.sent[-1]
+    outbound: dict[str, Any] = await fake_ws.wait_for_sent()
     rid = outbound.get("request_id")
     assert isinstance(rid, str)
 
     session_id = "sess-1"
-    await fake_ws.push(
-        {
-            "type": "session_created",
-            "request_id": rid,
-            "data": {
-                "session_id": session_id,
-                "status": "created",
-                "symbols": ["AAPL"],
-                "start_date": "2023-01-02T10:00:00Z",
-                "end_date": "2023-01-03T10:00:00Z",
-                "initial_capital": 100000,
-                "state": "created",
-                "created_at": "2023-01-02T10:00:00Z",
-                "data_provider": "polygon",
-                "commission_per_share": 0.005,
-                "slippage_bps": 5,
-            },
-        }
-    )
+    await fake_ws.push(session_created_msg(rid, session_id))
 
     _ = await start_task
 
     # Push history_snapshot -> should trigger on_session_start
-    await fake_ws.push(
-        {
-            "type": "history_snapshot",
-            "request_id": None,
-            "data": {
-                "session_id": session_id,
-                "timeframe": "1min",
-                "candles": {"AAPL": []},
-                "start": None,
-                "end": None,
-                "count": 0,
-            },
-        }
-    )
+    await fake_ws.push(history_snapshot_msg(session_id))
 
     await asyncio.wait_for(strat._start_ev.wait(), timeout=1.0)
 
@@ -182,5 +107,4 @@ async def test_strategy_callbacks_invoked(monkeypatch: pytest.MonkeyPatch) -> No
     assert "start" in kinds and "tick" in kinds and "end" in kinds
     assert kinds.index("start") < kinds.index("tick") < kinds.index("end")
 
-    await client.close()
 
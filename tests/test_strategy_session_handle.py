@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import asyncio
-import json
 from typing import Any, cast
 
 import pytest
 
 from simutrador_client.websocket import SimutradorClientSession
+from tests.ws_fakes import FakeAuth, FakeWS
 
 
 class StrategyWithSessionHook:
@@ -34,32 +33,6 @@ class StrategyWithSessionHook:
         return None
 
 
-class FakeAuth:
-    def get_cached_token(self) -> str | None:
-        return "FAKE"
-
-    def get_websocket_url(self, base_ws_url: str) -> str:
-        sep = "&" if "?" in base_ws_url else "?"
-        return f"{base_ws_url}{sep}token=FAKE"
-
-
-class FakeWS:
-    def __init__(self) -> None:
-        self.sent: list[dict[str, Any]] = []
-        self._q: asyncio.Queue[str] = asyncio.Queue()
-
-    async def send(self, text: str) -> None:
-        self.sent.append(json.loads(text))
-
-    async def recv(self) -> str:
-        # Keep connection idle
-        return await self._q.get()
-
-    async def close(self) -> None:  # pragma: no cover - trivial
-        return None
-
-
-@pytest.mark.asyncio
 async def test_strategy_set_session_hook_is_called_once(monkeypatch: pytest.MonkeyPatch) -> None:
     fake_ws = FakeWS()
 
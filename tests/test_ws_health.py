@@ -5,6 +5,14 @@ from datetime import UTC, datetime
 
 from simutrador_core.models.websocket import HealthStatus, WSMessage
 
+# Built once at import: the test only reads the envelope, never mutates it.
+_HEALTH_ENVELOPE = WSMessage(
+    type="health",
+    data=HealthStatus(status="ok").model_dump(mode="json"),
+    request_id=None,
+    timestamp=datetime.now(UTC),
+)
+
 
 def test_ws_health_parsing_works_without_server_import() -> None:
     """Validate client-side parsing of a health WSMessage without any server code.
@@ -12,16 +20,8 @@ def test_ws_health_parsing_works_without_server_import() -> None:
     This pure unit test constructs the envelope payload directly (no network),
     ensuring the client can parse HealthStatus embedded in WSMessage.
     """
-    hs = HealthStatus(status="ok")
-    envelope = WSMessage(
-        type="health",
-        data=hs.model_dump(mode="json"),
-        request_id=None,
-        timestamp=datetime.now(UTC),
-    )
-
     # Serialize to JSON and back to simulate transport
-    payload = json.loads(json.dumps(envelope.model_dump(mode="json")))
+    payload = json.loads(_HEALTH_ENVELOPE.model_dump_json())
 
     msg = WSMessage.model_validate(payload)
     assert msg.type == "health"
@@ -2,8 +2,11 @@
 Unit tests for authentication client.
 """
 
+from collections.abc import Awaitable, Callable, Generator
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, Mock, patch
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
 
 import httpx
 import pytest
@@ -16,71 +19,116 @@ from simutrador_client.auth import (
     set_auth_client,
 )
 
+# Immutable token payload shared by the login/refresh tests; built once at
+# module load instead of per test.
+_TOKEN_PAYLOAD = {
+    "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
+    "token_type": "bearer",
+    "expires_in": 3600,
+    "user_id": "user_123",
+    "plan": "professional",
+}
+
+
+def _expiry(hours: int) -> datetime:
+    """Token expiry relative to now; positive hours => still valid."""
+    return datetime.now(UTC) + timedelta(hours=hours)
+
+
+def _response(status_code: int, payload: dict[str, Any] | None = None) -> SimpleNamespace:
+    """Minimal HTTP response stub exposing only what login() reads."""
+    return SimpleNamespace(status_code=status_code, json=lambda: payload)
+
+
+def _async_return(value: Any) -> Callable[..., Awaitable[Any]]:
+    """Return a coroutine function that resolves to value.
+
+    Cheaper than AsyncMock for stubs whose calls are never asserted on.
+    """
+
+    async def _stub(*_args: Any, **_kwargs: Any) -> Any:
+        return value
+
+    return _stub
+
+
+def _async_raise(exc: Exception) -> Callable[..., Awaitable[Any]]:
+    """Return a coroutine function that raises exc when awaited."""
+
+    async def _stub(*_args: Any, **_kwargs: Any) -> Any:
+        raise exc
+
+    return _stub
+
+
+@pytest.fixture
+def mock_http_client() -> Generator[Any, None, None]:
+    """Patch httpx.AsyncClient and yield the client used inside 'async with'."""
+    with patch("httpx.AsyncClient") as mock_client:
+        yield mock_client.return_value.__aenter__.return_value
+
+
+_SERVER_URL = "http://test-server.com"
+
+
+@pytest.fixture(scope="module")
+def shared_auth_client() -> AuthClient:
+    """One AuthClient for the module; construction is not under test."""
+    return AuthClient(_SERVER_URL)
+
 
 class TestAuthClient:
     """Test AuthClient functionality."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.server_url = "http://test-server.com"
-        self.auth_client = AuthClient(self.server_url)
-        self.test_api_key = "sk_test_12345"
+    server_url = _SERVER_URL
+    test_api_key = "sk_test_12345"
+
+    @pytest.fixture(autouse=True)
+    def _attach_client(self, shared_auth_client: AuthClient) -> Generator[None, None, None]:
+        """Expose the shared client and wipe its token state after each test."""
+        self.auth_client = shared_auth_client
+        yield
+        shared_auth_client._cached_token = None
+        shared_auth_client._token_expires_at = None
 
-    @pytest.mark.asyncio
-    async def test_login_success(self):
+    async def test_login_success(self, mock_http_client: Any) -> None:
         """Test successful login."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
-            "token_type": "bearer",
-            "expires_in": 3600,
-            "user_id": "user_123",
-            "plan": "professional",
-        }
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
-
-            result = await self.auth_client.login(self.test_api_key)
-
-            assert isinstance(result, TokenResponse)
-            assert result.access_token == "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9..."
-            assert result.user_id == "user_123"
-            assert result.plan == UserPlan.PROFESSIONAL
-            assert result.expires_in == 3600
-
-    @pytest.mark.asyncio
-    async def test_login_invalid_api_key(self):
-        """Test login with invalid API key."""
-        mock_response = Mock()
-        mock_response.status_code = 401
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
-
-            with pytest.raises(AuthenticationError, match="Invalid API key"):
-                await self.auth_client.login(self.test_api_key)
-
-    @pytest.mark.asyncio
-    async def test_login_rate_limit(self):
-        """Test login with rate limit error."""
-        mock_response = Mock()
-        mock_response.status_code = 429
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
-
-            with pytest.raises(AuthenticationError, match="Rate limit exceeded"):
-                await self.auth_client.login(self.test_api_key)
-
-    @pytest.mark.asyncio
+        mock_http_client.post = _async_return(_response(200, _TOKEN_PAYLOAD))
+
+        result = await self.auth_client.login(self.test_api_key)
+
+        assert isinstance(result, TokenResponse)
+        assert result.access_token == "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9..."
+        assert result.user_id == "user_123"
+        assert result.plan == UserPlan.PROFESSIONAL
+        assert result.expires_in == 3600
+
+    @pytest.mark.parametrize(
+        ("post_stub", "match"),
+        [
+            pytest.param(_async_return(_response(401)), "Invalid API key", id="invalid_api_key"),
+            pytest.param(_async_return(_response(429)), "Rate limit exceeded", id="rate_limit"),
+            pytest.param(
+                _async_return(_response(500)),
+                "Authentication failed: 500",
+                id="unexpected_status",
+            ),
+            pytest.param(
+                _async_raise(httpx.RequestError("Connection failed")),
+                "Network error",
+                id="network_error",
+            ),
+        ],
+    )
+    async def test_login_failure(
+        self, mock_http_client: Any, post_stub: Callable[..., Awaitable[Any]], match: str
+    ) -> None:
+        """Test login error paths: non-200 responses and transport failures."""
+        mock_http_client.post = post_stub
+
+        with pytest.raises(AuthenticationError, match=match):
+            await self.auth_client.login(self.test_api_key)
+
     async def test_login_empty_api_key(self):
         """Test login with empty API key."""
         with pytest.raises(AuthenticationError, match="API key cannot be empty"):
@@ -89,17 +137,6 @@ class TestAuthClient:
         with pytest.raises(AuthenticationError, match="API key cannot be empty"):
             await self.auth_client.login("   ")
 
-    @pytest.mark.asyncio
-    async def test_login_network_error(self):
-        """Test login with network error."""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                side_effect=httpx.RequestError("Connection failed")
-            )
-
-            with pytest.raises(AuthenticationError, match="Network error"):
-                await self.auth_client.login(self.test_api_key)
-
     def test_get_cached_token_no_token(self):
         """Test getting cached token when none exists."""
         assert self.auth_client.get_cached_token() is None
@@ -108,9 +145,7 @@ class TestAuthClient:
         """Test getting valid cached token."""
         # Manually set cached token
         self.auth_client._cached_token = "test_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         assert self.auth_client.get_cached_token() == "test_token"
 
@@ -118,9 +153,7 @@ class TestAuthClient:
         """Test getting expired cached token."""
         # Set expired token
         self.auth_client._cached_token = "expired_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) - timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(-1)
 
         assert self.auth_client.get_cached_token() is None
         assert self.auth_client._cached_token is None
@@ -128,9 +161,7 @@ class TestAuthClient:
     def test_is_authenticated_true(self):
         """Test is_authenticated when token is valid."""
         self.auth_client._cached_token = "test_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         assert self.auth_client.is_authenticated() is True
 
@@ -141,7 +172,7 @@ class TestAuthClient:
     def test_get_token_info_authenticated(self):
         """Test getting token info when authenticated."""
         token = "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.test_payload.signature"
-        expires_at = datetime.now(UTC) + timedelta(hours=1)
+        expires_at = _expiry(1)
 
         self.auth_client._cached_token = token
         self.auth_client._token_expires_at = expires_at
@@ -161,9 +192,7 @@ class TestAuthClient:
         """Test logout functionality."""
         # Set up authenticated state
         self.auth_client._cached_token = "test_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         # Logout
         self.auth_client.logout()
@@ -172,42 +201,26 @@ class TestAuthClient:
         assert self.auth_client._token_expires_at is None
         assert self.auth_client.is_authenticated() is False
 
-    @pytest.mark.asyncio
-    async def test_refresh_token(self):
+    async def test_refresh_token(self, mock_http_client: Any) -> None:
         """Test token refresh."""
         # Set up initial token
         self.auth_client._cached_token = "old_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         # Mock successful refresh
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "access_token": "new_token",
-            "token_type": "bearer",
-            "expires_in": 3600,
-            "user_id": "user_123",
-            "plan": "professional",
-        }
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
-
-            result = await self.auth_client.refresh_token(self.test_api_key)
-
-            assert result.access_token == "new_token"
-            assert self.auth_client.get_cached_token() == "new_token"
+        mock_http_client.post = _async_return(
+            _response(200, {**_TOKEN_PAYLOAD, "access_token": "new_token"})
+        )
+
+        result = await self.auth_client.refresh_token(self.test_api_key)
+
+        assert result.access_token == "new_token"
+        assert self.auth_client.get_cached_token() == "new_token"
 
     def test_get_websocket_url_authenticated(self):
         """Test getting WebSocket URL when authenticated."""
         self.auth_client._cached_token = "test_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         base_url = "ws://localhost:8000/ws"
         result = self.auth_client.get_websocket_url(base_url)
@@ -217,9 +230,7 @@ class TestAuthClient:
     def test_get_websocket_url_with_existing_params(self):
         """Test getting WebSocket URL with existing query parameters."""
         self.auth_client._cached_token = "test_token"
-        self.auth_client._token_expires_at = datetime.now(UTC) + timedelta(
-            hours=1
-        )
+        self.auth_client._token_expires_at = _expiry(1)
 
         base_url = "ws://localhost:8000/ws?param=value"
         result = self.auth_client.get_websocket_url(base_url)
@@ -233,17 +244,21 @@ class TestAuthClient:
 
 
 class TestGlobalAuthClient:
-    """Test global auth client functions."""
+    """Test global auth client functions.
+
+    The module-level auth client is snapshotted and restored around every
+    test by the autouse fixture in tests/conftest.py.
+    """
 
-    def test_get_auth_client_default(self):
+    def test_get_auth_client_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test getting auth client with default settings."""
-        with patch("simutrador_client.settings.get_settings") as mock_settings:
-            mock_settings.return_value.auth.server_url = "http://default-server.com"
+        settings = SimpleNamespace(auth=SimpleNamespace(server_url="http://default-server.com"))
+        monkeypatch.setattr("simutrador_client.settings.get_settings", lambda: settings)
 
-            client = get_auth_client()
+        client = get_auth_client()
 
-            assert isinstance(client, AuthClient)
-            assert client.server_url == "http://default-server.com"
+        assert isinstance(client, AuthClient)
+        assert client.server_url == "http://default-server.com"
 
     def test_get_auth_client_custom_url(self):
         """Test getting auth client with custom URL."""
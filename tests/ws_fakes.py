@@ -0,0 +1,182 @@
+"""
+Shared fakes for WebSocket client tests.
+
+These replace the per-file copies of the auth stub, the in-memory WebSocket
+and the no-op strategy so each test module doesn't rebuild identical helpers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from simutrador_client.websocket import SimutradorClientSession
+
+# orjson bypasses the stdlib encoder for the fake wire format; fall back to
+# json so the fakes keep working in environments without the dev extra.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - exercised only without orjson
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+class FakeAuth:
+    def get_cached_token(self) -> str | None:
+        return "FAKE"
+
+    def get_websocket_url(self, base_ws_url: str) -> str:
+        sep = "&" if "?" in base_ws_url else "?"
+        return f"{base_ws_url}{sep}token=FAKE"
+
+
+class FakeWS:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self._q: asyncio.Queue[str] = asyncio.Queue()
+        self._sent_event: asyncio.Event = asyncio.Event()
+
+    async def send(self, text: str) -> None:
+        self.sent.append(_loads(text))
+        self._sent_event.set()
+
+    async def recv(self) -> str:
+        return await self._q.get()
+
+    async def wait_for_sent(
+        self, msg_type: str | None = None, timeout: float = 2.0
+    ) -> dict[str, Any]:
+        """Wait until an outbound message (optionally of msg_type) is sent.
+
+        Returns the most recent matching message. Event-driven replacement for
+        the old poll-and-sleep loops in the test bodies.
+        """
+
+        async def _wait() -> dict[str, Any]:
+            while True:
+                for msg in reversed(self.sent):
+                    if msg_type is None or msg.get("type") == msg_type:
+                        return msg
+                self._sent_event.clear()
+                await self._sent_event.wait()
+
+        return await asyncio.wait_for(_wait(), timeout=timeout)
+
+    async def wait_for_order_batch(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Wait for an outbound order_batch and return (message, orders).
+
+        Collapses the assert-type/unwrap-data/unwrap-orders idiom repeated at
+        every order-batch call site.
+        """
+        msg = await self.wait_for_sent("order_batch")
+        data = cast(dict[str, Any], msg.get("data") or {})
+        orders = cast(list[dict[str, Any]], data.get("orders") or [])
+        return msg, orders
+
+    async def close(self) -> None:  # pragma: no cover - trivial
+        return None
+
+    # Helper to push an incoming message
+    async def push(self, obj: dict[str, Any]) -> None:
+        await self._q.put(_dumps(obj))
+
+    async def push_raw(self, text: str) -> None:
+        """Push an already-serialized frame (for payloads serialized once per module)."""
+        await self._q.put(text)
+
+
+# ------------------------
+# Server-message builders
+# ------------------------
+# Shared templates for the frames the fake server replays; the builders below
+# derive per-test variants instead of each test rebuilding the full literal.
+
+_SESSION_CREATED_DATA: Mapping[str, Any] = MappingProxyType({
+    "session_id": "sess-1",
+    "status": "created",
+    "symbols": ["AAPL"],
+    "start_date": "2023-01-02T10:00:00Z",
+    "end_date": "2023-01-03T10:00:00Z",
+    "initial_capital": 100000,
+    "state": "created",
+    "created_at": "2023-01-02T10:00:00Z",
+    "data_provider": "polygon",
+    "commission_per_share": 0.005,
+    "slippage_bps": 5,
+})
+
+
+def session_created_msg(request_id: str, session_id: str = "sess-1") -> dict[str, Any]:
+    return {
+        "type": "session_created",
+        "request_id": request_id,
+        "data": {**_SESSION_CREATED_DATA, "session_id": session_id},
+    }
+
+
+def history_snapshot_msg(
+    session_id: str, candles: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    return {
+        "type": "history_snapshot",
+        "request_id": None,
+        "data": {
+            "session_id": session_id,
+            "timeframe": "1min",
+            "candles": candles if candles is not None else {"AAPL": []},
+            "start": None,
+            "end": None,
+            "count": 0,
+        },
+    }
+
+
+def tick_msg(session_id: str, candles: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "tick", "data": {"session_id": session_id, "candles": candles}}
+
+
+def batch_ack_msg(
+    request_id: Any, batch_id: str, accepted_orders: list[Any]
+) -> dict[str, Any]:
+    return {
+        "type": "batch_ack",
+        "request_id": request_id,
+        "data": {
+            "batch_id": batch_id,
+            "accepted_orders": accepted_orders,
+            "rejected_orders": {},
+            "estimated_fills": {},
+        },
+    }
+
+
+# Signature of the make_ws_client factory fixture (see tests/conftest.py).
+WsClientFactory = Callable[..., Awaitable[tuple["SimutradorClientSession", FakeWS]]]
+
+
+class NoopStrategy:
+    async def on_session_start(
+        self, session_id: str, store: Any, meta: dict[str, Any] | None = None
+    ) -> None:
+        return None
+
+    async def on_tick(self, session_id: str, tick: Any, store: Any) -> None:
+        return None
+
+    async def on_fill(self, session_id: str, fill: Any, store: Any) -> None:
+        return None
+
+    async def on_account_snapshot(self, session_id: str, account: Any, store: Any) -> None:
+        return None
+
+    async def on_session_end(self, session_id: str, end: Any, store: Any) -> None:
+        return None